@@ -10,8 +10,712 @@ from tkinter import messagebox # Import messagebox for displaying alerts
 import pyperclip #  Import pyperclip library for clipboard operations
 from fpdf import FPDF # Import FPDF for PDF generation
 from tkinter import filedialog # Import filedialog for file saving dialogs 
+import os # Import os for reading environment switches and building file paths
+import time # Import time for measuring call latencies
+import json # Import json for exporting metrics snapshots
+import cProfile # Import cProfile for optional per-call profiling dumps
+import functools # Import functools to keep the names of instrumented functions
+import threading # Import threading to guard the metrics counters
+import io # Import io for building sink batches in memory
+import csv # Import csv for writing the ingest archive
+import fnmatch # Import fnmatch for matching order file names in the watch folder
+import signal # Import signal for stopping the ingest daemon cleanly
+import argparse # Import argparse for the command line switches
+import binascii # Import binascii for the CRC of checksummed codes
+import operator # Import operator for turning CRC mismatches into flags
+import struct # Import struct for the fixed-size records of the recent orders file
+import mmap # Import mmap for loading the recent orders file without reading it through Python
+import queue # Import queue for handing recent orders to the background writer
+
+# Instrumentation switches, read once at start-up from the environment
+# ARBURG_METRICS=1 turns instrumentation on, ARBURG_METRICS_DIR chooses where the snapshot is written on exit
+# ARBURG_PROFILE_DIR additionally writes one cProfile dump per instrumented call into that directory
+METRICS_ENABLED = os.environ.get("ARBURG_METRICS", "0") not in ("", "0", "false", "False")
+METRICS_DIR = os.environ.get("ARBURG_METRICS_DIR", ".")
+PROFILE_DIR = os.environ.get("ARBURG_PROFILE_DIR") or None
+
+# Upper bounds (in seconds) of the latency histogram buckets, the last bucket (+Inf) is implicit
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Collects invocation counts, errors, latency histograms and free-form counters such as Tcl widget calls
+class Metrics:
+    def __init__(self, enabled=False, profile_dir=None):
+        self.enabled = enabled # Master switch, nothing is recorded while it is off
+        self.profile_dir = profile_dir # Directory for per-call cProfile dumps, None disables profiling
+        self.lock = threading.Lock() # Guard the counters, the ingest daemon may record from worker threads
+        self.profile_lock = threading.Lock() # Held while a call is being profiled, only one profiler may run in the process at a time
+        self.local = threading.local() # Per-thread nesting depth of instrumented calls
+        self.reset()
+
+    # Function drops every recorded value
+    def reset(self):
+        self.calls = {} # Invocation count per instrumented name
+        self.errors = {} # Count of calls that raised an exception per instrumented name
+        self.histograms = {} # Per name: [bucket counts (one per LATENCY_BUCKETS entry plus +Inf), sum of seconds]
+        self.counters = {} # Free-form counters such as Tcl widget calls
+        self.profile_sequence = 0 # Running number used to name the cProfile dumps
+
+    # Function records one finished call of an instrumented function
+    def observe(self, name, seconds, failed=False):
+        with self.lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if failed:
+                self.errors[name] = self.errors.get(name, 0) + 1
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = [[0] * (len(LATENCY_BUCKETS) + 1), 0.0]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    break
+            else:
+                i = len(LATENCY_BUCKETS) # Slower than the largest bound, count it in the +Inf bucket
+            histogram[0][i] += 1
+            histogram[1] += seconds
+
+    # Function increases a free-form counter
+    def incr(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    # Function runs an instrumented function, timing it and optionally profiling it
+    # Only the outermost instrumented call is profiled: a nested profiler would stop the outer one when it finishes
+    # (and raises on Python 3.12+), so e.g. get_specs is profiled including the codec calls it makes
+    def run(self, name, func, args, kwargs):
+        depth = getattr(self.local, "depth", 0)
+        profiler = None
+        if self.profile_dir and depth == 0 and self.profile_lock.acquire(blocking=False): # Skip if another thread is being profiled
+            profiler = cProfile.Profile()
+        self.local.depth = depth + 1
+        failed = False
+        start = time.perf_counter()
+        try:
+            if profiler is not None:
+                return profiler.runcall(func, *args, **kwargs)
+            return func(*args, **kwargs)
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.local.depth = depth
+            self.observe(name, time.perf_counter() - start, failed)
+            if profiler is not None:
+                self.profile_lock.release()
+                with self.lock:
+                    self.profile_sequence += 1
+                    sequence = self.profile_sequence
+                os.makedirs(self.profile_dir, exist_ok=True)
+                profiler.dump_stats(os.path.join(self.profile_dir, "%s-%06d.prof" % (name, sequence)))
+
+    # Function returns a plain copy of everything recorded so far
+    def snapshot(self):
+        with self.lock:
+            return {
+                "calls": dict(self.calls),
+                "errors": dict(self.errors),
+                "counters": dict(self.counters),
+                "latency_seconds": {
+                    name: {
+                        "buckets": dict(zip([str(bound) for bound in LATENCY_BUCKETS] + ["+Inf"], buckets)),
+                        "count": sum(buckets),
+                        "sum": total,
+                    }
+                    for name, (buckets, total) in self.histograms.items()
+                },
+            }
+
+    # Function renders the snapshot in the Prometheus text exposition format
+    def to_prometheus(self):
+        snapshot = self.snapshot()
+        lines = []
+        lines.append("# TYPE arburg_calls_total counter")
+        for name, count in sorted(snapshot["calls"].items()):
+            lines.append('arburg_calls_total{name="%s"} %d' % (name, count))
+        lines.append("# TYPE arburg_errors_total counter")
+        for name, count in sorted(snapshot["errors"].items()):
+            lines.append('arburg_errors_total{name="%s"} %d' % (name, count))
+        lines.append("# TYPE arburg_events_total counter")
+        for name, count in sorted(snapshot["counters"].items()):
+            lines.append('arburg_events_total{name="%s"} %d' % (name, count))
+        lines.append("# TYPE arburg_latency_seconds histogram")
+        for name, histogram in sorted(snapshot["latency_seconds"].items()):
+            cumulative = 0 # Prometheus buckets are cumulative, the snapshot keeps them per bucket
+            for bound, count in histogram["buckets"].items():
+                cumulative += count
+                lines.append('arburg_latency_seconds_bucket{name="%s",le="%s"} %d' % (name, bound, cumulative))
+            lines.append('arburg_latency_seconds_sum{name="%s"} %.9f' % (name, histogram["sum"]))
+            lines.append('arburg_latency_seconds_count{name="%s"} %d' % (name, histogram["count"]))
+        return "\n".join(lines) + "\n"
+
+    # Function writes the snapshot as a Prometheus text file
+    def export_prometheus(self, file_name):
+        with open(file_name, "w") as f:
+            f.write(self.to_prometheus())
+
+    # Function writes the snapshot as a JSON file
+    def export_json(self, file_name):
+        with open(file_name, "w") as f:
+            json.dump(self.snapshot(), f, indent=2, sort_keys=True)
+
+    # Function writes both export formats into a directory
+    def export(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        self.export_prometheus(os.path.join(directory, "arburg_metrics.prom"))
+        self.export_json(os.path.join(directory, "arburg_metrics.json"))
+
+# Shared metrics registry used by every instrumented function
+METRICS = Metrics(enabled=METRICS_ENABLED, profile_dir=PROFILE_DIR)
+
+# Decorator times a function into the shared registry under the given name
+# When instrumentation is off at start-up the function is returned untouched, so disabled builds pay nothing
+def instrumented(name):
+    def decorator(func):
+        if not METRICS.enabled:
+            return func
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return METRICS.run(name, func, args, kwargs)
+        return wrapper
+    return decorator
+
+# Stands in for the Tcl interpreter of the root window and counts every widget command sent to Tcl
+class TclCallCounter:
+    def __init__(self, tkapp, metrics):
+        self._tkapp = tkapp # The real Tcl interpreter
+        self._metrics = metrics # Registry receiving the "tcl_widget_calls" counter
+
+    def call(self, *args):
+        self._metrics.incr("tcl_widget_calls")
+        return self._tkapp.call(*args)
+
+    def __getattr__(self, attribute):
+        return getattr(self._tkapp, attribute) # Everything except call() goes straight to the interpreter
+
+# Dictionaries mapping robot names, colors, grippers, communication protocols, and addons to their 16-bit binary representations.
+# These dictionaries enable easy lookup for encoding and decoding robot specifications.
+# They live at module level so the headless ingest mode can decode codes without opening a window.
+
+# Robot types dictionary
+ROBOT_DICT = {
+    "Iontec": "0000000000000001",
+    "Cybertech-2": "0000000000000010",
+    "Cybertech nano-2": "0000000000000011",
+    "Agilus-2": "0000000000000100",
+    "KR4 und Scara": "0000000000000101",
+    "KR12 Scara": "0000000000000110",
+    # "Robot 7": "0000000000000111",
+    # "Robot 8": "0000000000001000",
+    # "Robot 9": "0000000000001001",
+    # "Robot 10": "0000000000001010",
+    # "Robot 11": "0000000000001011",
+    # "Robot 12": "0000000000001100",
+    # "Robot 13": "0000000000001101",
+    # "Robot 14": "0000000000001110",
+    # "Robot 15": "0000000000001111",
+    # "Robot 16": "0000000000010000"
+}
+
+# Robot names dictionary 
+COLOR_DICT = {
+    "KR 20 R3100 Iontec": "0000000000010111",
+    "KR 30 R2100 Iontec": "0000000000011000",
+    "KR 08 R2010 Cybertech-2": "0000000000011001",
+    "KR 12 R1810 Cybertech-2": "0000000000011010",
+    "KR 16 R1610 Cybertech-2": "0000000000011011",
+    "KR 6 R1840-2 Cybertech nano": "0000000000011100",
+    "KR 8 R1640-2 Cybertech nano": "0000000000011101",
+    "KR 10 R1440-2 Cybertech nano": "0000000000011110",
+    "KR6 R700-2 AGILUS": "0000000000011111",
+    "KR6 R900-2 AGILUS": "0000000000100000",
+    "KR10 R900-2 AGILUS": "0000000000100001",
+    "KR4 R600 Agilus": "0000000000100010",
+    "KR6 R500 Z200-2 Scara": "0000000000100011",
+    "KR12 R650 Z400 Scara": "0000000000100100",
+    "KR12 R750 Z400 Scara": "0000000000100101",
+    "KR12 R850 Z400 Scara": "0000000000100110"
+}
+
+# Gripper types dictionary
+GRIPPERS_DICT = {
+    "Hydraulic": "0000000001000001",
+    "Magnetic": "0000000001000010",
+    "Vacuum Gripper": "0000000001000011",
+    "Sys Parallel Gripper": "0000000001000100",
+    "Pneumatic": "0000000001000101",
+    "Electric": "0000000001000110",
+    "Soft Hand": "0000000001000111",
+    "Needle": "0000000001001000",
+    "Three-Finger": "0000000001001001",
+    "Angled": "0000000001001010",
+    "Adhesive": "0000000001001011",
+    "Suction Cup": "0000000001001100",
+    "Clamp": "0000000001001101",
+    "Hook": "0000000001001110",
+    "Screwdriver": "0000000001001111",
+    "Welding Torch": "0000000001010000"
+}
+
+# Communication protocols dictionary
+COMMUNICATION_PROTOCOLS_DICT = {
+    "WIFI": "0000000001010101",
+    "EtherCAT": "0000000001010110",
+    "Hardwiring": "0000000001010111",
+    "Bluetooth": "0000000001011000",
+    "5G": "0000000001011001",
+    "TCP/IP": "0000000001011010",
+    "OPC UA": "0000000001011011",
+    "UDP": "0000000001011100",
+    "FTP": "0000000001011101",
+    "SNMP": "0000000001011110",
+    "SPI/I2C": "0000000001011111",
+    "Profinet": "0000000001100000",
+    "CAN Bus": "0000000001100001",
+    "Modbus": "0000000001100010",
+    "BACnet": "0000000001100011",
+    "LonWorks": "0000000001100100"
+}
+
+# Addons dictionary
+ADDONS_DICT = {
+    "Conveyor Belt": "0000000001100101",
+    "FSD": "0000000001100110",
+    "AGV": "0000000001100111",
+    "Vision System": "0000000001101000",
+    "Path Planning": "0000000001101001",
+    "Safety System": "0000000001101010",
+    "Palletizing": "0000000001101011",
+    "Tool Changer": "0000000001101100",
+    "Robot Controller": "0000000001101101",
+    "Cobot": "0000000001101110",
+    "ROS": "0000000001101111",
+    "Data Storage": "0000000001110000",
+    "Robot Arm": "0000000001110001",
+    "Gripper Kit": "0000000001110010",
+    "Sensor Kit": "0000000001110011",
+    "Actuator Kit": "0000000001110100"
+}
+
+# Reverse lookups from a 16-bit field value to its name, built once so decoding is a single dictionary access per field
+ROBOT_BY_VALUE = {int(binary, 2): robot for robot, binary in ROBOT_DICT.items()}
+COLOR_BY_VALUE = {int(binary, 2): color for color, binary in COLOR_DICT.items()}
+GRIPPER_BY_VALUE = {int(binary, 2): gripper for gripper, binary in GRIPPERS_DICT.items()}
+
+# Protocol and addon names in bit order, index 0 is the most significant bit of the 16-bit field
+ROBOT_NAMES = list(ROBOT_DICT.keys())
+COLOR_NAMES = list(COLOR_DICT.keys())
+GRIPPER_NAMES = list(GRIPPERS_DICT.keys())
+PROTOCOL_NAMES = list(COMMUNICATION_PROTOCOLS_DICT.keys())
+ADDON_NAMES = list(ADDONS_DICT.keys())
+
+# Function returns the names whose bits are set in a bit mask, the first name is the most significant bit as in the code
+def mask_to_names(mask, names):
+    top = len(names) - 1
+    return [name for i, name in enumerate(names) if mask >> (top - i) & 1]
+
+# Function builds the bit mask of the selected names, in the same bit order as the code
+def names_to_mask(selected, names):
+    top = len(names) - 1
+    mask = 0
+    for i, name in enumerate(names):
+        if name in selected:
+            mask |= 1 << (top - i)
+    return mask
+
+# Checksummed codes carry the 80-bit specification followed by a CRC-16 of it, always written as "0x" + 24 hex digits
+# A checksummed value is at least 2**80 (the robot type field is never zero), so it can never be mistaken for a legacy code
+# Modes: "checked" accepts only checksummed codes, "legacy" only the original 80-bit codes, "any" accepts both
+CODE_MODES = ("checked", "legacy", "any")
+CHECKED_CODE_DIGITS = 24
+
+# Function computes the CRC-16 (CCITT) of an 80-bit specification value
+def code_checksum(value):
+    return binascii.crc_hqx(value.to_bytes(10, "big"), 0xFFFF)
+
+# Function formats an 80-bit specification value as a code, optionally with the checksum appended
+def format_code(value, checksum=False):
+    if checksum:
+        return "0x%0*x" % (CHECKED_CODE_DIGITS, value << 16 | code_checksum(value))
+    return hex(value)
+
+# Function checks the integrity of one code and returns its 80-bit specification value, or None if it is corrupt or not allowed in this mode
+def check_code(hex_value, mode="any"):
+    try:
+        value = int(hex_value, 16) # Convert the hexadecimal value to an integer
+    except ValueError:
+        return None
+    if value < 0:
+        return None
+    if value >> 80: # Checksummed code, verify the CRC before any field is looked at
+        if mode == "legacy" or value >> 96:
+            return None
+        payload = value >> 16
+        return payload if code_checksum(payload) == value & 0xFFFF else None
+    return value if mode != "checked" else None
+
+# Function returns the 80-bit specification value of a code that already passed validation
+def code_payload(hex_value):
+    value = int(hex_value, 16)
+    return value >> 16 if value >> 80 else value
+
+# CRC-16 (CCITT) lookup table split into high and low bytes, so one CRC step can run over a whole column of bytes with bytes.translate()
+CRC_HIGH_BYTES = bytes(binascii.crc_hqx(bytes([i]), 0) >> 8 for i in range(256))
+CRC_LOW_BYTES = bytes(binascii.crc_hqx(bytes([i]), 0) & 0xFF for i in range(256))
+
+# Function verifies the CRCs of many fixed-width checksummed codes at once, given their hex digits concatenated without prefixes
+# The codes are handled column by column: byte k of every code is one strided slice, held as one big integer, so each
+# CRC step is a single XOR and table lookup over the whole batch instead of a loop over the codes
+# Returns one flag per code, or None if the digits do not line up (a non-hex digit or embedded whitespace)
+def checksum_flags(digits, count, mode):
+    try:
+        data = bytes.fromhex(digits)
+    except ValueError:
+        return None
+    width = CHECKED_CODE_DIGITS // 2 # Bytes per checksummed code
+    if len(data) != width * count: # bytes.fromhex skips whitespace, which would shift every later code
+        return None
+    high = low = (1 << 8 * count) - 1 # The CRC register of every code starts at 0xFFFF
+    for k in range(10):
+        index = (high ^ int.from_bytes(data[k::width], "big")).to_bytes(count, "big")
+        high = low ^ int.from_bytes(index.translate(CRC_HIGH_BYTES), "big")
+        low = int.from_bytes(index.translate(CRC_LOW_BYTES), "big")
+    mismatch = ((high ^ int.from_bytes(data[10::width], "big")) | (low ^ int.from_bytes(data[11::width], "big"))).to_bytes(count, "big")
+    flags = list(map(operator.not_, mismatch)) # A zero byte means the stored CRC matches
+    # A zero top field means a zero-padded legacy code, which carries no checksum
+    top = (int.from_bytes(data[0::width], "big") | int.from_bytes(data[1::width], "big")).to_bytes(count, "big")
+    i = top.find(0)
+    while i >= 0:
+        flags[i] = mode != "checked"
+        i = top.find(0, i + 1)
+    return flags
+
+# Function validates a batch of codes before any field is decoded, returning one flag per code (True if it is intact and allowed in this mode)
+# Batches of "0x" + 24 digit codes go straight to checksum_flags(), mixed batches are grouped first and the odd codes are checked one by one
+def validate_codes(hex_values, mode="checked"):
+    count = len(hex_values)
+    width = CHECKED_CODE_DIGITS + 2 # Characters per checksummed code including the "0x" prefix
+    joined = "".join(hex_values)
+    if mode != "legacy" and count and set(map(len, hex_values)) == {width} and joined[::width] == "0" * count and joined[1::width] == "x" * count:
+        flags = checksum_flags(joined.replace("0x", ""), count, mode)
+        if flags is not None:
+            return flags
+
+    flags = [False] * count
+    fixed_width_index = [] # Positions of the codes taking the batch path
+    fixed_width_digits = [] # Their hex digits without the "0x" prefix
+    for i, hex_value in enumerate(hex_values):
+        digits = hex_value.strip()
+        if digits[:2] in ("0x", "0X"):
+            digits = digits[2:]
+        if len(digits) == CHECKED_CODE_DIGITS and mode != "legacy":
+            fixed_width_index.append(i)
+            fixed_width_digits.append(digits)
+        else:
+            flags[i] = check_code(hex_value, mode) is not None
+    if fixed_width_index:
+        group_flags = checksum_flags("".join(fixed_width_digits), len(fixed_width_index), mode)
+        if group_flags is None:
+            group_flags = [check_code(hex_values[i], mode) is not None for i in fixed_width_index]
+        for i, flag in zip(fixed_width_index, group_flags):
+            flags[i] = flag
+    return flags
+
+# Function decodes an 80-bit specification value into (robot type, robot name, gripper, communication protocols, addons), or None if a field is invalid
+def decode_payload(value):
+    # Split the 80-bit value into robot type, robot name, gripper, communication protocols and addons fields
+    decoded_robot = ROBOT_BY_VALUE.get(value >> 64 & 0xFFFF)
+    decoded_color = COLOR_BY_VALUE.get(value >> 48 & 0xFFFF)
+    decoded_gripper = GRIPPER_BY_VALUE.get(value >> 32 & 0xFFFF)
+    decoded_communication_protocols = mask_to_names(value >> 16 & 0xFFFF, PROTOCOL_NAMES)
+    decoded_addons = mask_to_names(value & 0xFFFF, ADDON_NAMES)
+
+    # Every field has to decode to at least one known value
+    if not decoded_robot or not decoded_color or not decoded_gripper or not decoded_communication_protocols or not decoded_addons:
+        return None
+    return decoded_robot, decoded_color, decoded_gripper, decoded_communication_protocols, decoded_addons
+
+# Function decodes a hexadecimal code into its robot specifications without touching the GUI
+# Returns (robot type, robot name, gripper, communication protocols, addons) or None if the code is invalid
+def decode_code(hex_value, mode="any"):
+    value = check_code(hex_value, mode)
+    if value is None:
+        return None
+    return decode_payload(value)
+
+# Robot names belonging to each robot type
+ROBOT_TYPE_NAMES = {
+    "Iontec": ["KR 20 R3100 Iontec", "KR 30 R2100 Iontec"],
+    "Cybertech-2": ["KR 08 R2010 Cybertech-2", "KR 12 R1810 Cybertech-2", "KR 16 R1610 Cybertech-2"],
+    "Cybertech nano-2": ["KR 6 R1840-2 Cybertech nano", "KR 8 R1640-2 Cybertech nano", "KR 10 R1440-2 Cybertech nano"],
+    "Agilus-2": ["KR6 R700-2 AGILUS", "KR6 R900-2 AGILUS", "KR10 R900-2 AGILUS"],
+    "KR4 und Scara": ["KR4 R600 Agilus", "KR6 R500 Z200-2 Scara"],
+    "KR12 Scara": ["KR12 R650 Z400 Scara", "KR12 R750 Z400 Scara", "KR12 R850 Z400 Scara"]
+}
+ROBOT_TYPE_BY_NAME = {name: robot for robot, names in ROBOT_TYPE_NAMES.items() for name in names}
+
+# Optional JSON file restricting what each robot name supports, for example
+# {"KR4 R600 Agilus": {"grippers": ["Vacuum Gripper"], "protocols": ["EtherCAT", "Profinet"], "addons": ["Vision System"]}}
+# Robot names or keys missing from the file allow every option
+COMPATIBILITY_FILE = os.environ.get("ARBURG_COMPATIBILITY_FILE", "robot_compatibility.json")
+
+# Single bit of each gripper field value, in the same bit order as the gripper masks
+GRIPPER_BITS = {int(binary, 2): 1 << (len(GRIPPER_NAMES) - 1 - i) for i, binary in enumerate(GRIPPERS_DICT.values())}
+
+# Holds, for every robot name, bit masks of the grippers, communication protocols and addons it supports
+# Protocol and addon masks use the bit order of the code, so checking a selection against a robot is a single AND
+class CompatibilityMatrix:
+    def __init__(self, allowed=None):
+        allowed = allowed or {} # Robot name -> {"grippers": [...], "protocols": [...], "addons": [...]}
+        # Reject anything that is not a known name, a typo must not silently allow or forbid every option
+        option_names = {"grippers": GRIPPERS_DICT, "protocols": COMMUNICATION_PROTOCOLS_DICT, "addons": ADDONS_DICT}
+        for color, options in allowed.items():
+            if color not in COLOR_DICT:
+                raise ValueError(f"Unknown robot name in compatibility data: {color}")
+            for key, names in options.items():
+                if key not in option_names:
+                    raise ValueError(f"Unknown key in compatibility data for {color}: {key} (expected grippers, protocols or addons)")
+                for name in names:
+                    if name not in option_names[key]:
+                        raise ValueError(f"Unknown {key[:-1]} in compatibility data for {color}: {name}")
+        self.all_grippers = (1 << len(GRIPPER_NAMES)) - 1 # Masks allowing every option
+        self.all_protocols = (1 << len(PROTOCOL_NAMES)) - 1
+        self.all_addons = (1 << len(ADDON_NAMES)) - 1
+        self.masks = {} # Robot name -> (gripper mask, protocol mask, addon mask)
+        self.forbidden_by_value = {} # Robot name field value -> mask of forbidden selections, laid out like selection_word()
+        for color, binary in COLOR_DICT.items():
+            options = allowed.get(color, {})
+            gripper_mask = names_to_mask(options["grippers"], GRIPPER_NAMES) if "grippers" in options else self.all_grippers
+            protocol_mask = names_to_mask(options["protocols"], PROTOCOL_NAMES) if "protocols" in options else self.all_protocols
+            addon_mask = names_to_mask(options["addons"], ADDON_NAMES) if "addons" in options else self.all_addons
+            self.masks[color] = (gripper_mask, protocol_mask, addon_mask)
+            self.forbidden_by_value[int(binary, 2)] = (self.all_grippers & ~gripper_mask) << 32 | (self.all_protocols & ~protocol_mask) << 16 | (self.all_addons & ~addon_mask)
+        self.type_name_masks = {robot: names_to_mask(names, COLOR_NAMES) for robot, names in ROBOT_TYPE_NAMES.items()} # Robot type -> mask of its robot names
+
+    # Function loads the compatibility data from a JSON file, everything is allowed if the file does not exist
+    @classmethod
+    def from_file(cls, file_name=COMPATIBILITY_FILE):
+        if not os.path.exists(file_name):
+            return cls()
+        with open(file_name) as f:
+            return cls(json.load(f))
+
+    # Function returns the (gripper, protocol, addon) masks of a robot name, everything is allowed for "All" or an unknown name
+    def allowed(self, color):
+        return self.masks.get(color, (self.all_grippers, self.all_protocols, self.all_addons))
+
+    # Function returns the robot names of a robot type, or every robot name for "All"
+    def robot_names(self, robot):
+        if robot not in self.type_name_masks:
+            return list(COLOR_NAMES)
+        return mask_to_names(self.type_name_masks[robot], COLOR_NAMES)
+
+    # Function returns the mask of forbidden selections in an 80-bit specification value, 0 if the order is compatible
+    def violations(self, value):
+        return selection_word(value) & self.forbidden_by_value.get(value >> 48 & 0xFFFF, 0)
+
+    # Function checks a batch of 80-bit specification values, returning the violation mask of each (0 where compatible)
+    # The masks are looked up by the robot name field, so the cost per order does not grow with the number of models
+    def check_orders(self, values):
+        forbidden_by_value = self.forbidden_by_value
+        gripper_bits = GRIPPER_BITS
+        return [(gripper_bits.get(value >> 32 & 0xFFFF, 0) << 32 | value & 0xFFFFFFFF) & forbidden_by_value.get(value >> 48 & 0xFFFF, 0) for value in values]
+
+    # Function lists the forbidden grippers, protocols and addons of a violation mask
+    def violation_names(self, violation):
+        return mask_to_names(violation >> 32, GRIPPER_NAMES) + mask_to_names(violation >> 16 & 0xFFFF, PROTOCOL_NAMES) + mask_to_names(violation & 0xFFFF, ADDON_NAMES)
+
+# Function builds the selection word of an 80-bit specification value: the gripper as a single bit, then the protocol and addon fields as they are
+def selection_word(value):
+    return GRIPPER_BITS.get(value >> 32 & 0xFFFF, 0) << 32 | value & 0xFFFFFFFF
+
+# Recent orders file: a header followed by a ring of fixed-size records, the oldest record is overwritten once the file is full
+# Header: magic, version, capacity, number of stored records, slot the next record goes to
+# Record: timestamp, 80-bit specification value, checksum flag, then the decoded spec as robot type, robot name and gripper
+# indexes plus the protocol and addon bit masks, so a recalled order is displayed without decoding its code
+RECENT_ORDERS_FILE = os.environ.get("ARBURG_RECENT_FILE") or os.path.join(os.path.expanduser("~"), ".arburg_recent_orders.bin")
+RECENT_ORDERS_HEADER = struct.Struct(">4sBxHII")
+RECENT_ORDERS_RECORD = struct.Struct(">d10sBBBBHH")
+RECENT_ORDERS_MAGIC = b"ARBR"
+RECENT_ORDERS_VERSION = 1
+
+# Function packs an order into a record of the recent orders file
+def pack_recent_order(timestamp, code, spec):
+    robot, color, gripper, communication_protocols, addons = spec
+    return RECENT_ORDERS_RECORD.pack(timestamp, code_payload(code).to_bytes(10, "big"), int(code, 16) >> 80 != 0,
+                                     ROBOT_NAMES.index(robot), COLOR_NAMES.index(color), GRIPPER_NAMES.index(gripper),
+                                     names_to_mask(communication_protocols, PROTOCOL_NAMES), names_to_mask(addons, ADDON_NAMES))
+
+# Function unpacks a record of the recent orders file into (timestamp, code, spec), or returns None if the record is damaged
+# The stored spec has to agree with the stored code, so a flipped byte anywhere in the record is caught without decoding the code
+def unpack_recent_order(record):
+    timestamp, payload, checksum, robot, color, gripper, protocols, addons = RECENT_ORDERS_RECORD.unpack(record)
+    if checksum > 1 or robot >= len(ROBOT_NAMES) or color >= len(COLOR_NAMES) or gripper >= len(GRIPPER_NAMES):
+        return None
+    value = int.from_bytes(payload, "big")
+    if (ROBOT_BY_VALUE.get(value >> 64 & 0xFFFF) != ROBOT_NAMES[robot] or COLOR_BY_VALUE.get(value >> 48 & 0xFFFF) != COLOR_NAMES[color]
+            or GRIPPER_BY_VALUE.get(value >> 32 & 0xFFFF) != GRIPPER_NAMES[gripper] or value >> 16 & 0xFFFF != protocols or value & 0xFFFF != addons):
+        return None
+    spec = (ROBOT_NAMES[robot], COLOR_NAMES[color], GRIPPER_NAMES[gripper], mask_to_names(protocols, PROTOCOL_NAMES), mask_to_names(addons, ADDON_NAMES))
+    return timestamp, format_code(value, checksum=checksum), spec
+
+# Keeps the most recent orders in memory and in a size-capped file
+# The file is read once with mmap after the window is shown, new orders are written in batches by a background thread
+class RecentOrdersStore:
+    def __init__(self, file_name=RECENT_ORDERS_FILE, capacity=500):
+        self.file_name = file_name # Ring file holding the orders between sessions
+        self.capacity = capacity # Maximum number of orders kept, used when a new file is created
+        self.orders = [] # Newest first: (timestamp, code, (robot type, robot name, gripper, protocols, addons))
+        self.loaded = False # Set once the file has been read
+        self.lock = threading.Lock() # Keeps the loader from reading a batch that is only half written
+        self.queue = queue.Queue() # Packed records waiting for the writer thread
+        self.writer = None # Background writer thread, started with the first order
+
+    # Function reads the raw records of the ring file, oldest first, and returns ((capacity, count, next slot, records), damaged)
+    # The ring is None if the file does not exist yet or cannot be used
+    def read_ring(self):
+        if not os.path.exists(self.file_name) or os.path.getsize(self.file_name) == 0:
+            return None, False
+        try:
+            with open(self.file_name, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                magic, version, capacity, count, next_slot = RECENT_ORDERS_HEADER.unpack_from(m, 0)
+                if magic != RECENT_ORDERS_MAGIC or version != RECENT_ORDERS_VERSION or capacity == 0 or count > capacity or next_slot >= capacity or len(m) < RECENT_ORDERS_HEADER.size + capacity * RECENT_ORDERS_RECORD.size:
+                    return None, True
+                slots = list(range(count)) if count < capacity else list(range(next_slot, capacity)) + list(range(next_slot))
+                starts = [RECENT_ORDERS_HEADER.size + slot * RECENT_ORDERS_RECORD.size for slot in slots]
+                records = [m[start:start + RECENT_ORDERS_RECORD.size] for start in starts]
+        except (OSError, ValueError, struct.error):
+            return None, True
+        return (capacity, count, next_slot, records), False
+
+    # Function reads every stored order from the file, oldest first, and returns (orders, damaged)
+    # Records that do not unpack to a known specification are skipped and reported as damage
+    def read_file(self):
+        with self.lock:
+            ring, damaged = self.read_ring()
+        orders = []
+        for record in ring[3] if ring else []:
+            order = unpack_recent_order(record)
+            if order is None:
+                damaged = True
+            else:
+                orders.append(order)
+        return orders, damaged
+
+    # Function loads the stored orders, keeping any order added before the load finished
+    # A damaged file is rewritten in the background from the orders that could be read
+    def load(self):
+        if self.loaded:
+            return
+        added = self.orders
+        self.orders = []
+        orders, damaged = self.read_file()
+        for order in orders + added[::-1]:
+            self.remember(order)
+        self.loaded = True
+        if damaged:
+            self.start_writer()
+            self.queue.put([pack_recent_order(*order) for order in reversed(self.orders)]) # A list asks the writer to replace the file
+
+    # Function puts an order at the top of the in-memory list, replacing an older entry with the same code
+    def remember(self, order):
+        self.orders = [order] + [existing for existing in self.orders if existing[1] != order[1]]
+        del self.orders[self.capacity:]
+
+    # Function records an order, the caller only pays for packing the record
+    def add(self, code, decoded_values):
+        robot, color, gripper, communication_protocols, addons = decoded_values
+        order = (time.time(), code, (robot, color, gripper, list(communication_protocols), list(addons)))
+        self.remember(order)
+        self.start_writer()
+        self.queue.put(pack_recent_order(*order))
+
+    # Function starts the background writer thread if it is not running yet
+    def start_writer(self):
+        if self.writer is None:
+            self.writer = threading.Thread(target=self.write_loop, name="recent-orders-writer", daemon=True)
+            self.writer.start()
+
+    # Function returns the orders whose code or specification contains the search text, newest first
+    def search(self, text):
+        text = text.strip().lower()
+        if not text:
+            return list(self.orders)
+        return [order for order in self.orders if text in (order[1] + " " + " ".join(order[2][:3]) + " " + " ".join(order[2][3] + order[2][4])).lower()]
+
+    # Function runs in the writer thread, writing whatever has queued up in one batch
+    # Queued items are packed records, a list of records replacing the whole file, or None to stop
+    def write_loop(self):
+        while True:
+            items = [self.queue.get()]
+            while True:
+                try:
+                    items.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                records = []
+                for item in items + [None]:
+                    if isinstance(item, bytes):
+                        records.append(item)
+                        continue
+                    if records:
+                        self.write_records(records)
+                        records = []
+                    if isinstance(item, list):
+                        self.write_records(item, replace=True)
+            except OSError:
+                METRICS.incr("recent_orders_write_errors") # A disk problem only loses the history, never the current order
+            if None in items:
+                return
+
+    # Function writes records to the ring file, overwriting the oldest ones once it is full
+    # Older records of the same codes are dropped, so repeating an order never pushes other orders out of the file
+    @instrumented("recent_orders.write")
+    def write_records(self, records, replace=False):
+        with self.lock:
+            ring = None if replace else self.read_ring()[0]
+            existing = ring[3] if ring else []
+            capacity = ring[0] if ring else self.capacity
+
+            # Keep the newest record of every code in the batch, and drop the stored records of those codes
+            codes = set()
+            newest = []
+            for record in reversed(records):
+                if record[8:19] not in codes: # Specification value and checksum flag identify the code
+                    codes.add(record[8:19])
+                    newest.append(record)
+            newest.reverse()
+            kept = [record for record in existing if record[8:19] not in codes]
+
+            if ring is None or len(kept) < len(existing):
+                # Write the whole file with all slots allocated, so it can be memory-mapped in one piece
+                ordered = (kept + newest)[-capacity:]
+                with open(self.file_name, "wb") as f:
+                    f.write(RECENT_ORDERS_HEADER.pack(RECENT_ORDERS_MAGIC, RECENT_ORDERS_VERSION, capacity, len(ordered), len(ordered) % capacity))
+                    f.write(b"".join(ordered))
+                    f.write(bytes((capacity - len(ordered)) * RECENT_ORDERS_RECORD.size))
+                return
+
+            # Only new codes, write them into the next slots of the ring
+            count, next_slot = ring[1], ring[2]
+            with open(self.file_name, "r+b") as f:
+                for record in newest[-capacity:]:
+                    f.seek(RECENT_ORDERS_HEADER.size + next_slot * RECENT_ORDERS_RECORD.size)
+                    f.write(record)
+                    next_slot = (next_slot + 1) % capacity
+                    count = min(count + 1, capacity)
+                f.seek(0)
+                f.write(RECENT_ORDERS_HEADER.pack(RECENT_ORDERS_MAGIC, RECENT_ORDERS_VERSION, capacity, count, next_slot))
+
+    # Function waits until every queued order is on disk and stops the writer
+    def close(self):
+        if self.writer is not None:
+            self.queue.put(None)
+            self.writer.join()
+            self.writer = None
 
 class RobotInterface:
+    @instrumented("gui.select_robot")
     def select_robot(self):
         self.robot_combobox.config(state="readonly") # Set robot type combobox to readonly
         self.color_combobox.config(state="readonly") # Set robot name combobox to readonly
@@ -22,6 +726,7 @@ class RobotInterface:
         self.hexadecimal_button.config(state="normal") # Enable hexadecimal button
         self.robot_button.config(state="disabled") # Disable robot button
     
+    @instrumented("gui.select_hexadecimal")
     def select_hexadecimal(self):
         self.robot_combobox.config(state="readonly") # Set robot type combobox to readonly
         self.color_combobox.config(state="readonly") # Set robot name combobox to readonly
@@ -33,7 +738,9 @@ class RobotInterface:
         self.hexadecimal_entry.config(state="normal") # Enable hexadecimal entry
         self.robot_button.config(state="disabled") # Disable robot button
         self.hexadecimal_button.config(state="normal") # Enable hexadecimal button
+        self.apply_compatibility() # Keep unsupported options disabled
     
+    @instrumented("gui.export_to_pdf")
     def export_to_pdf(self):
         hex_value = self.hexadecimal_entry.get() # Get the hexadecimal value from the entry
         if hex_value:
@@ -90,112 +797,27 @@ class RobotInterface:
             
     def __init__(self, root):
         self.root = root # Store the root window
+        if METRICS.enabled:
+            self.root.tk = TclCallCounter(self.root.tk, METRICS) # Count Tcl widget calls, widgets created below inherit the counting interpreter
         self.root.title("Robot Specifications") # Set the window title
         self.cleared = False # Flag to track if the interface has been cleared
 
         # Dictionaries mapping robot names, colors, grippers, communication protocols, and addons to their 16-bit binary representations.
-        # These dictionaries enable easy lookup for encoding and decoding robot specifications.
-        
-        # Robot types dictionary
-        self.robot_dict = {
-            "Iontec": "0000000000000001",
-            "Cybertech-2": "0000000000000010",
-            "Cybertech nano-2": "0000000000000011",
-            "Agilus-2": "0000000000000100",
-            "KR4 und Scara": "0000000000000101",
-            "KR12 Scara": "0000000000000110",
-            # "Robot 7": "0000000000000111",
-            # "Robot 8": "0000000000001000",
-            # "Robot 9": "0000000000001001",
-            # "Robot 10": "0000000000001010",
-            # "Robot 11": "0000000000001011",
-            # "Robot 12": "0000000000001100",
-            # "Robot 13": "0000000000001101",
-            # "Robot 14": "0000000000001110",
-            # "Robot 15": "0000000000001111",
-            # "Robot 16": "0000000000010000"
-        }
-
-        # Robot names dictionary 
-        self.color_dict = {
-            "KR 20 R3100 Iontec": "0000000000010111",
-            "KR 30 R2100 Iontec": "0000000000011000",
-            "KR 08 R2010 Cybertech-2": "0000000000011001",
-            "KR 12 R1810 Cybertech-2": "0000000000011010",
-            "KR 16 R1610 Cybertech-2": "0000000000011011",
-            "KR 6 R1840-2 Cybertech nano": "0000000000011100",
-            "KR 8 R1640-2 Cybertech nano": "0000000000011101",
-            "KR 10 R1440-2 Cybertech nano": "0000000000011110",
-            "KR6 R700-2 AGILUS": "0000000000011111",
-            "KR6 R900-2 AGILUS": "0000000000100000",
-            "KR10 R900-2 AGILUS": "0000000000100001",
-            "KR4 R600 Agilus": "0000000000100010",
-            "KR6 R500 Z200-2 Scara": "0000000000100011",
-            "KR12 R650 Z400 Scara": "0000000000100100",
-            "KR12 R750 Z400 Scara": "0000000000100101",
-            "KR12 R850 Z400 Scara": "0000000000100110"
-        }
-
-        # Gripper types dictionary
-        self.grippers_dict = {
-            "Hydraulic": "0000000001000001",
-            "Magnetic": "0000000001000010",
-            "Vacuum Gripper": "0000000001000011",
-            "Sys Parallel Gripper": "0000000001000100",
-            "Pneumatic": "0000000001000101",
-            "Electric": "0000000001000110",
-            "Soft Hand": "0000000001000111",
-            "Needle": "0000000001001000",
-            "Three-Finger": "0000000001001001",
-            "Angled": "0000000001001010",
-            "Adhesive": "0000000001001011",
-            "Suction Cup": "0000000001001100",
-            "Clamp": "0000000001001101",
-            "Hook": "0000000001001110",
-            "Screwdriver": "0000000001001111",
-            "Welding Torch": "0000000001010000"
-        }
-
-        # Communication protocols dictionary
-        self.communication_protocols_dict = {
-            "WIFI": "0000000001010101",
-            "EtherCAT": "0000000001010110",
-            "Hardwiring": "0000000001010111",
-            "Bluetooth": "0000000001011000",
-            "5G": "0000000001011001",
-            "TCP/IP": "0000000001011010",
-            "OPC UA": "0000000001011011",
-            "UDP": "0000000001011100",
-            "FTP": "0000000001011101",
-            "SNMP": "0000000001011110",
-            "SPI/I2C": "0000000001011111",
-            "Profinet": "0000000001100000",
-            "CAN Bus": "0000000001100001",
-            "Modbus": "0000000001100010",
-            "BACnet": "0000000001100011",
-            "LonWorks": "0000000001100100"
-        }
-        
-        # Addons dictionary
-        self.addons_dict = {
-            "Conveyor Belt": "0000000001100101",
-            "FSD": "0000000001100110",
-            "AGV": "0000000001100111",
-            "Vision System": "0000000001101000",
-            "Path Planning": "0000000001101001",
-            "Safety System": "0000000001101010",
-            "Palletizing": "0000000001101011",
-            "Tool Changer": "0000000001101100",
-            "Robot Controller": "0000000001101101",
-            "Cobot": "0000000001101110",
-            "ROS": "0000000001101111",
-            "Data Storage": "0000000001110000",
-            "Robot Arm": "0000000001110001",
-            "Gripper Kit": "0000000001110010",
-            "Sensor Kit": "0000000001110011",
-            "Actuator Kit": "0000000001110100"
-        }
+        # They are defined at module level and shared with the headless ingest mode.
+        self.robot_dict = ROBOT_DICT # Robot types dictionary
+        self.color_dict = COLOR_DICT # Robot names dictionary
+        self.grippers_dict = GRIPPERS_DICT # Gripper types dictionary
+        self.communication_protocols_dict = COMMUNICATION_PROTOCOLS_DICT # Communication protocols dictionary
+        self.addons_dict = ADDONS_DICT # Addons dictionary
         
+        # Load which grippers, communication protocols and addons each robot name supports
+        try:
+            self.compatibility = CompatibilityMatrix.from_file()
+        except (ValueError, OSError, AttributeError) as e:
+            # A broken data file must not keep the window from opening, continue without restrictions instead
+            messagebox.showerror("Error", "Could not load the compatibility data from " + COMPATIBILITY_FILE + ": " + str(e) + "\nNo options will be flagged as unsupported.")
+            self.compatibility = CompatibilityMatrix()
+
         # Create a dictionary to map binary values to robots
         self.binary_to_robot = {}
         for robot, binary in self.robot_dict.items():
@@ -291,6 +913,7 @@ class RobotInterface:
 
         # Create a dictionary to store the communication protocols checkbuttons
         self.communication_protocols_checkbuttons = {}
+        self.communication_protocols_widgets = {} # Checkbutton widgets by protocol, used to enable only supported protocols
 
         # Create a frame to hold the communication protocols checkbuttons
         self.communication_protocols_checkbuttons_frame = tk.Frame(self.communication_protocols_frame)
@@ -302,6 +925,7 @@ class RobotInterface:
             checkbutton = tk.Checkbutton(self.communication_protocols_checkbuttons_frame, text=protocol, variable=var, state="normal")
             checkbutton.pack(side=tk.LEFT) 
             self.communication_protocols_checkbuttons[protocol] = var # Store the variable in the dictionary
+            self.communication_protocols_widgets[protocol] = checkbutton # Store the widget in the dictionary
 
         # Create a frame for addons
         self.addons_frame = tk.Frame(frame)
@@ -313,6 +937,7 @@ class RobotInterface:
 
         # Create a dictionary to store the addons checkbuttons
         self.addons_checkbuttons = {}
+        self.addons_widgets = {} # Checkbutton widgets by addon, used to enable only supported addons
 
         # Create a frame to hold the addons checkbuttons
         self.addons_checkbuttons_frame = tk.Frame(self.addons_frame)
@@ -324,6 +949,7 @@ class RobotInterface:
             checkbutton = tk.Checkbutton(self.addons_checkbuttons_frame, text=addon, variable=var, state="normal")
             checkbutton.pack(side=tk.LEFT)
             self.addons_checkbuttons[addon] = var # Store the variable in the dictionary
+            self.addons_widgets[addon] = checkbutton # Store the widget in the dictionary
 
         # Create a label to display the text "Hexadecimal Value"
         self.hexadecimal_label = tk.Label(frame, text="Hexadecimal Value")
@@ -333,6 +959,11 @@ class RobotInterface:
         self.hexadecimal_entry = tk.Entry(frame, state="readonly")
         self.hexadecimal_entry.grid(row=3, column=2, padx=10, pady=10)
 
+        # Create a checkbutton to append a checksum to newly generated codes
+        self.checksum_var = tk.IntVar(value=0) # Off by default, generated codes stay in the original format unless requested
+        self.checksum_checkbutton = tk.Checkbutton(frame, text="Add checksum", variable=self.checksum_var)
+        self.checksum_checkbutton.grid(row=4, column=2, padx=10, pady=10)
+
         # Create a frame to hold the buttons and treeview
         self.bottom_frame = tk.Frame(self.main_frame)
         self.bottom_frame.pack(side=tk.TOP, fill="both", expand=True)
@@ -377,6 +1008,23 @@ class RobotInterface:
         self.export_button = tk.Button(self.middle_button_frame_middle_center, text="Export to PDF", command=self.export_to_pdf) # Specify the function to call when the button is pressed
         self.export_button.pack(side=tk.LEFT, padx=10) # Align the Export to PDF button in the interface 
 
+        # Create a frame to hold the searchable list of recent orders
+        self.recent_orders = RecentOrdersStore() # Orders from earlier sessions, loaded once the window is shown
+        self.recent_matches = [] # Orders currently shown in the list, in list order
+        self.recent_frame = tk.Frame(self.bottom_frame)
+        self.recent_frame.pack(side=tk.TOP, fill="x")
+
+        # Create a label and an entry to search the recent orders
+        self.recent_label = tk.Label(self.recent_frame, text="Recent Orders")
+        self.recent_label.pack(side=tk.TOP, anchor="w", padx=10)
+        self.recent_search_var = tk.StringVar() # Search text, the list is filtered as it is typed
+        self.recent_search_entry = tk.Entry(self.recent_frame, textvariable=self.recent_search_var)
+        self.recent_search_entry.pack(side=tk.TOP, fill="x", padx=10)
+
+        # Create a listbox showing the matching recent orders, selecting one recalls it
+        self.recent_listbox = tk.Listbox(self.recent_frame, height=6, exportselection=False)
+        self.recent_listbox.pack(side=tk.TOP, fill="x", padx=10, pady=(0, 10))
+
         # Bind the combobox selected event to their respective functions
         self.robot_combobox.bind("<<ComboboxSelected>>", self.on_robot_type_selected)  # Event for when robot type is selected
         self.color_combobox.bind("<<ComboboxSelected>>", self.on_color_selected)  # Event for when robot name is selected
@@ -384,8 +1032,12 @@ class RobotInterface:
         # Loop through each protocol and bind their state change to a function
         for protocol, var in self.communication_protocols_checkbuttons.items():
             var.trace("w", lambda name, index, mode, var=var: self.on_communication_protocol_selected()) # Trace changes in the variable's state (checked/unchecked) to trigger the protocol selection handler
+        self.recent_search_var.trace("w", lambda name, index, mode: self.on_recent_search()) # Filter the recent orders as the search text changes
+        self.recent_listbox.bind("<<ListboxSelect>>", self.on_recent_order_selected) # Event for when a recent order is selected
+        self.root.after(100, self.load_recent_orders) # Load the recent orders after the window is shown, so start-up does not wait for the file
     
     # Copies the current hexadecimal value from the entry field to the clipboard
+    @instrumented("gui.copy_code")
     def copy_code(self):
         hex_value = self.hexadecimal_entry.get()  # Get the current hexadecimal value from the entry field
         if hex_value: # Check if there is a value to copy
@@ -395,22 +1047,12 @@ class RobotInterface:
             messagebox.showerror("Error", "No hexadecimal value to copy") # Show an error message
 
     # Function handles the selection of a robot type from the robot_combobox.
+    @instrumented("gui.on_robot_type_selected")
     def on_robot_type_selected(self, event):
         robot_type = self.robot_combobox.get() # Get the selected robot type
         if robot_type != "All":  # If a specific robot type is selected
-            # Set the values of the robot_name_combobox based on the selected robot type
-            if robot_type == "Iontec":
-                self.color_combobox['values'] = ["All", "KR 20 R3100 Iontec", "KR 30 R2100 Iontec"]
-            elif robot_type == "Cybertech-2":
-                self.color_combobox['values'] = ["All", "KR 08 R2010 Cybertech-2", "KR 12 R1810 Cybertech-2", "KR 16 R1610 Cybertech-2"]
-            elif robot_type == "Cybertech nano-2":
-                self.color_combobox['values'] = ["All", "KR 6 R1840-2 Cybertech nano", "KR 8 R1640-2 Cybertech nano", "KR 10 R1440-2 Cybertech nano"]
-            elif robot_type == "Agilus-2":
-                self.color_combobox['values'] = ["All", "KR6 R700-2 AGILUS", "KR6 R900-2 AGILUS", "KR10 R900-2 AGILUS"]
-            elif robot_type == "KR4 und Scara":
-                self.color_combobox['values'] = ["All", "KR4 R600 Agilus", "KR6 R500 Z200-2 Scara"]
-            elif robot_type == "KR12 Scara":
-                self.color_combobox['values'] = ["All", "KR12 R650 Z400 Scara", "KR12 R750 Z400 Scara", "KR12 R850 Z400 Scara"]
+            # Set the values of the robot_name_combobox to the robot names of the selected robot type
+            self.color_combobox['values'] = ["All"] + self.compatibility.robot_names(robot_type)
             self.color_combobox.set("All")
         else: # If "All" is selected, display all color option
             self.color_combobox['values'] = ["All"] + list(self.color_dict.keys())
@@ -425,27 +1067,15 @@ class RobotInterface:
         # Enable frames for communication protocols and addons
         self.communication_protocols_frame.config(state="normal")
         self.addons_frame.config(state="normal")
+        self.apply_compatibility() # The robot name was reset, allow every option again
 
     # Function handles the selection of a robot name from the robot_name_combobox
+    @instrumented("gui.on_color_selected")
     def on_color_selected(self, event):
         color = self.color_combobox.get() # Get the selected robot name
         if color != "All": # If a specific robot name is selected
             # Set the robot_combobox to the corresponding robot type based on the selected robot name
-            if "Iontec" in color:
-                self.robot_combobox.set("Iontec")
-            elif "Cybertech-2" in color:
-                self.robot_combobox.set("Cybertech-2")
-            elif "Cybertech nano" in color:
-                self.robot_combobox.set("Cybertech nano-2")
-            elif "AGILUS" in color:
-                self.robot_combobox.set("Agilus-2")
-            elif "Agilus" in color and "Scara" not in color:
-                self.robot_combobox.set("KR4 und Scara")
-            elif "Scara" in color:
-                if "KR12" in color:
-                    self.robot_combobox.set("KR12 Scara")
-                else:
-                    self.robot_combobox.set("KR4 und Scara")
+            self.robot_combobox.set(ROBOT_TYPE_BY_NAME[color])
         else: 
             self.robot_combobox.set("All") # Reset robot selection if "All" is selected
         if self.gripper_combobox['state'] != 'readonly': # Ensure the gripper_combobox is readonly
@@ -453,8 +1083,29 @@ class RobotInterface:
         # Enable frames for communication protocols and addons
         self.communication_protocols_frame.config(state="normal")
         self.addons_frame.config(state="normal")
+        self.apply_compatibility() # Offer only the options the selected robot name supports
+
+    # Function limits the gripper choices and the protocol and addon checkbuttons to what the selected robot name supports
+    # Unsupported selections are cleared, so they cannot end up in a generated code
+    def apply_compatibility(self):
+        gripper_mask, protocol_mask, addon_mask = self.compatibility.allowed(self.color_combobox.get())
+        grippers = mask_to_names(gripper_mask, GRIPPER_NAMES)
+        self.gripper_combobox['values'] = ["All"] + grippers # Narrow the gripper choices
+        if self.gripper_combobox.get() in self.grippers_dict and self.gripper_combobox.get() not in grippers:
+            self.gripper_combobox.set("All") # Reset a gripper the robot name does not support
+        for names, mask, variables, widgets in ((PROTOCOL_NAMES, protocol_mask, self.communication_protocols_checkbuttons, self.communication_protocols_widgets),
+                                                (ADDON_NAMES, addon_mask, self.addons_checkbuttons, self.addons_widgets)):
+            top = len(names) - 1
+            for i, name in enumerate(names):
+                if mask >> (top - i) & 1:
+                    widgets[name].config(state="normal") # Supported, enable the checkbutton
+                else:
+                    if variables[name].get():
+                        variables[name].set(0) # Uncheck an unsupported selection
+                    widgets[name].config(state="disabled") # Unsupported, disable the checkbutton
 
     # Function handles the selection of a gripper and enables associated options
+    @instrumented("gui.on_gripper_selected")
     def on_gripper_selected(self):
         # Enable all communication protocol checkbuttons
         for widget in self.communication_protocols_checkbuttons_frame.winfo_children():
@@ -465,6 +1116,7 @@ class RobotInterface:
         # Ensure the communication protocols and addons frames are enabled
         self.communication_protocols_frame.config(state="normal")
         self.addons_frame.config(state="normal")
+        self.apply_compatibility() # Keep unsupported options disabled
         # Set the communication protocol checkbuttons based on previously decoded protocols
         for protocol, var in self.communication_protocols_checkbuttons.items():
             if protocol in decoded_communication_protocols:
@@ -473,18 +1125,21 @@ class RobotInterface:
                 var.set(0) # Set to unchecked if not
 
     # Function handles changes to the selected communication protocols
+    @instrumented("gui.on_communication_protocol_selected")
     def on_communication_protocol_selected(self):
         # Gather selected protocols based on the checkbutton states
         selected_protocols = [protocol for protocol, var in self.communication_protocols_checkbuttons.items() if var.get()]
+        addon_mask = self.compatibility.allowed(self.color_combobox.get())[2] # Addons the selected robot name supports
+        top = len(ADDON_NAMES) - 1
         if selected_protocols: # If any protocols are selected
-            # Enable addons checkbuttons
-            for widget in self.addons_checkbuttons_frame.winfo_children():
-                if widget['state'] != 'normal':
+            # Enable supported addons checkbuttons
+            for i, widget in enumerate(self.addons_checkbuttons_frame.winfo_children()):
+                if widget['state'] != 'normal' and addon_mask >> (top - i) & 1:
                     widget.config(state="normal")
         else:
             # Disable addons checkbuttons if no protocols are selected
-            for widget in self.addons_checkbuttons_frame.winfo_children():
-                if widget['state'] != 'normal':
+            for i, widget in enumerate(self.addons_checkbuttons_frame.winfo_children()):
+                if widget['state'] != 'normal' and addon_mask >> (top - i) & 1:
                     widget.config(state="normal")
                 var.set(0) # Ensure the variable is unchecked
     
@@ -495,6 +1150,7 @@ class RobotInterface:
             combobox.config(state="normal") 
 
     # Function clears all input fields, selections and outputs
+    @instrumented("gui.clear_table")
     def clear_table(self):
         self.robot_combobox.set("All") # Reset robot type selection to "All"
         self.color_combobox.set("All") # Reset robot name selection to "All"
@@ -532,6 +1188,7 @@ class RobotInterface:
         self.addons_frame.config(state="normal") # Keep addons frame enabled
 
     # Function handles the generate hexadecimal 
+    @instrumented("codec.generate_hexadecimal")
     def generate_hexadecimal(self, robot, color, gripper, communication_protocols, addons):
         # Convert selected robot, color and gripper from binary string to integer for bit manipulation
         robot_binary = int(self.robot_dict[robot], 2)
@@ -582,64 +1239,111 @@ class RobotInterface:
         return final_binary, final_hex
     
     # Function handles hexadecimal input to decode and retrieve robot specifications 
+    @instrumented("codec.decode_hexadecimal")
     def decode_hexadecimal(self, hex_value):
-        try:
-            # Convert the hexadecimal value to a binary string, ensure it's 80 bits long
-            binary_value = bin(int(hex_value, 16))[2:].zfill(80)
-        except ValueError:
-            messagebox.showerror("Error",  "Invalid hexadecimal value") # Show error message if the entered hexadecimal value is invalid
-            return 
-        
-        # Check if the binary value is valid
-        if len(binary_value) != 80:
-            messagebox.showerror("Error", "Invalid hexadecimal value") # Show error message if the generated binary value is invalid
+        # Decode with the shared rules, also used by the headless ingest mode
+        decoded_values = decode_code(hex_value)
+        if decoded_values is None:
+            messagebox.showerror("Error", "Invalid hexadecimal value") # If the value is not hexadecimal or any decoded value is invalid or missing, show an error message
             return None
-
-        # # Split binary string
-        # robot_color_gripper_binary = binary_value[:48]
-        # communication_addons_binary = binary_value[48:]
-
-        # Split binary strings to represent robot type, robot name, gripper and communication_addons
-        robot_binary = binary_value[:16]
-        color_binary = binary_value[16:32]
-        gripper_binary = binary_value[32:48]
-        communication_addons_binary = binary_value[48:]
-        
-        #  Split communication_addons_binary into two parts:  communication and addons
-        communication_protocols_binary = communication_addons_binary[:16]
-        addons_binary = communication_addons_binary[16:]
-
-        # Decode robot, color and gripper using dictionary lookups
-        decoded_robot = [robot for robot, binary in self.robot_dict.items() if binary == robot_binary]
-        decoded_color = [color for color, binary in self.color_dict.items() if binary == color_binary]
-        decoded_gripper = [gripper for gripper, binary in self.grippers_dict.items() if binary == gripper_binary]
-
-        # Decode communication protocols and addons
-        # communication_addons_binary_list = list(communication_addons_binary)
-        # communication_protocols_binary = communication_addons_binary_list[:16]
-        # addons_binary = communication_addons_binary_list[16:]
-
-        # Decode the selected communication protocols
-        decoded_communication_protocols = []
-        for i, protocol in enumerate(self.communication_protocols_dict.keys()):
-            if communication_protocols_binary[i] == '1':
-                decoded_communication_protocols.append(protocol)
-
-        # Decode the selected addons
-        decoded_addons = []
-        for i, addon in enumerate(self.addons_dict.keys()):
-            if addons_binary[i] == '1':
-                decoded_addons.append(addon)
-                
-        # Check if any of the decoded values are missing        
-        if not decoded_robot or not decoded_color or not decoded_gripper or not decoded_communication_protocols or not decoded_addons:
-            messagebox.showerror("Error", "Invalid hexadecimal value") # If any decoded value is invalid or missing, show an error message
-            return
         
         # If all decoded values are valid, return the robot type, robot name,  gripper, communication protocols and addons
-        return decoded_robot[0], decoded_color[0], decoded_gripper[0], decoded_communication_protocols, decoded_addons
+        return decoded_values
     
+    # Function loads the recent orders from disk and shows them in the list
+    @instrumented("gui.load_recent_orders")
+    def load_recent_orders(self):
+        self.recent_orders.load()
+        self.on_recent_search()
+
+    # Function fills the recent orders list with the orders matching the search text
+    def on_recent_search(self):
+        self.recent_matches = self.recent_orders.search(self.recent_search_var.get())
+        self.recent_listbox.delete(0, tk.END)
+        for timestamp, code, spec in self.recent_matches:
+            self.recent_listbox.insert(tk.END, time.strftime("%Y-%m-%d %H:%M", time.localtime(timestamp)) + "   " + spec[1] + "   " + code)
+
+    # Function recalls the selected recent order straight from its stored specification, without decoding its code
+    @instrumented("gui.on_recent_order_selected")
+    def on_recent_order_selected(self, event):
+        selection = self.recent_listbox.curselection()
+        if not selection:
+            return
+        timestamp, code, spec = self.recent_matches[selection[0]]
+        if not self.check_compatibility(code_payload(code), spec[1]):
+            return # The compatibility data may have changed since the order was stored
+        METRICS.incr("cache_hits") # The stored specification stands in for decoding the code
+        self.tree.delete(*self.tree.get_children()) # Clear the existing items in the tree view
+        # Show the recalled code in the hexadecimal entry field
+        self.hexadecimal_entry.config(state="normal")
+        self.hexadecimal_entry.delete(0, tk.END)
+        self.hexadecimal_entry.insert(0, code)
+        self.hexadecimal_entry.config(state="readonly")
+        self.show_decoded_specs(code, spec)
+
+    # Function stores an order in the recent orders, the list itself is refreshed once the GUI is idle
+    def remember_order(self, code, decoded_values):
+        self.recent_orders.add(code, decoded_values)
+        self.root.after_idle(self.on_recent_search)
+
+    # Function checks an order against the compatibility matrix and shows an error listing the unsupported options
+    def check_compatibility(self, value, color):
+        violation = self.compatibility.violations(value)
+        if violation:
+            messagebox.showerror("Error", color + " does not support: " + ", ".join(self.compatibility.violation_names(violation)))
+            return False
+        return True
+
+    # Function displays decoded specifications in the tree view and sets the comboboxes and checkbuttons to them
+    def show_decoded_specs(self, hex_value, decoded_values):
+        # Unpack the decoded values into individual variables
+        decoded_robot, decoded_color, decoded_gripper, decoded_communication_protocols, decoded_addons = decoded_values
+        # Insert the decoded values into the tree view for display
+        self.tree.insert('', 'end', values=("Robot Type", decoded_robot))
+        self.tree.insert('', 'end', values=("Robot Name", decoded_color))
+        self.tree.insert('', 'end', values=("Gripper", decoded_gripper))
+        self.tree.insert('', 'end', values=("Communication Protocols", ', '.join(decoded_communication_protocols)))
+        self.tree.insert('', 'end', values=("Addons", ', '.join(decoded_addons)))
+        self.tree.insert('', 'end', values=("Hexadecimal Value", hex_value))
+
+        # Set the comboboxes to the decoded values
+        self.robot_combobox.set(decoded_robot)
+        self.color_combobox.set(decoded_color)
+        self.gripper_combobox.set(decoded_gripper)
+        # Check the communication protocols and addons, setting their respective checkbuttons
+        for protocol, var in self.communication_protocols_checkbuttons.items():
+            if protocol in decoded_communication_protocols:
+                var.set(1)
+            else:
+                var.set(0)
+        for addon, var in self.addons_checkbuttons.items():
+            if addon in decoded_addons:
+                var.set(1)
+            else:
+                var.set(0)
+
+        # Enable all the relevant options and frames
+        self.robot_combobox.config(state="normal")
+        self.color_combobox.config(state="normal")
+        self.gripper_combobox.config(state="normal")
+        self.communication_protocols_frame.config(state="normal")
+        self.addons_frame.config(state="normal")
+        # Make all checkbuttons in the communication protocols and addons frames active
+        for widget in self.communication_protocols_checkbuttons_frame.winfo_children():
+            widget.config(state="normal")
+        for widget in self.addons_checkbuttons_frame.winfo_children():
+            widget.config(state="normal")
+        for widget in self.communication_protocols_checkbuttons_frame.winfo_children():
+            widget.config(state="normal")
+        # self.gripper_combobox.config(state="normal")
+        # self.gripper_combobox.set(decoded_gripper)
+        # self.on_gripper_selected()
+        # Call the function to handle communication protocol selections
+        self.on_communication_protocol_selected()
+        self.apply_compatibility() # Keep unsupported options disabled
+
     # Function handles to display output
+    @instrumented("gui.get_specs")
     def get_specs(self):
         # Clear the existing items in the tree view
         self.tree.delete(*self.tree.get_children())
@@ -654,51 +1358,11 @@ class RobotInterface:
             # If decoding failed, exit the function
             if decoded_values is None:
                 return
+            if not self.check_compatibility(code_payload(hex_value), decoded_values[1]):
+                return
         
-            # Unpack the decoded values into individual variables
-            decoded_robot, decoded_color, decoded_gripper, decoded_communication_protocols, decoded_addons = self.decode_hexadecimal(hex_value)
-            # Insert the decoded values into the tree view for display
-            self.tree.insert('', 'end', values=("Robot Type", decoded_robot))
-            self.tree.insert('', 'end', values=("Robot Name", decoded_color))
-            self.tree.insert('', 'end', values=("Gripper", decoded_gripper))
-            self.tree.insert('', 'end', values=("Communication Protocols", ', '.join(decoded_communication_protocols)))
-            self.tree.insert('', 'end', values=("Addons", ', '.join(decoded_addons)))
-            self.tree.insert('', 'end', values=("Hexadecimal Value", hex_value))
-            
-            # Set the comboboxes to the decoded values
-            self.robot_combobox.set(decoded_robot)
-            self.color_combobox.set(decoded_color)
-            self.gripper_combobox.set(decoded_gripper)
-            # Check the communication protocols and addons, setting their respective checkbuttons
-            for protocol, var in self.communication_protocols_checkbuttons.items():
-                if protocol in decoded_communication_protocols:
-                    var.set(1)
-                else:
-                    var.set(0)
-            for addon, var in self.addons_checkbuttons.items():
-                if addon in decoded_addons:
-                    var.set(1)
-                else:
-                    var.set(0)
-            
-            # Enable all the relevant options and frames
-            self.robot_combobox.config(state="normal")
-            self.color_combobox.config(state="normal")
-            self.gripper_combobox.config(state="normal")
-            self.communication_protocols_frame.config(state="normal")
-            self.addons_frame.config(state="normal")
-            # Make all checkbuttons in the communication protocols and addons frames active
-            for widget in self.communication_protocols_checkbuttons_frame.winfo_children():
-                widget.config(state="normal")
-            for widget in self.addons_checkbuttons_frame.winfo_children():
-                widget.config(state="normal")
-            for widget in self.communication_protocols_checkbuttons_frame.winfo_children():
-                widget.config(state="normal")
-            # self.gripper_combobox.config(state="normal")
-            # self.gripper_combobox.set(decoded_gripper)
-            # self.on_gripper_selected()
-            # Call the function to handle communication protocol selections
-            self.on_communication_protocol_selected()
+            self.show_decoded_specs(hex_value, decoded_values) # Display the decoded values and fill the selections
+            self.remember_order(hex_value, decoded_values) # Remember the order, it is written to disk in the background
         #     except Exception as e:
         #         messagebox.showerror("Error", "Invalid hexadecimal value")
         else:
@@ -728,10 +1392,13 @@ class RobotInterface:
             else:
                 # Generate hexadecimal value based on selected options
                 binary_result, hex_result = self.generate_hexadecimal(robot, color, gripper, communication_protocols, addons)
+                if not self.check_compatibility(hex_result, color):
+                    return
+                code = format_code(hex_result, checksum=self.checksum_var.get()) # Append the checksum if requested
                 # Update the hexadecimal entry field with the new value
                 self.hexadecimal_entry.config(state="normal")
                 self.hexadecimal_entry.delete(0, tk.END)
-                self.hexadecimal_entry.insert(0, hex(hex_result))
+                self.hexadecimal_entry.insert(0, code)
                 self.hexadecimal_entry.config(state="readonly")
 
                 # Insert the selected options into the tree view for display
@@ -740,14 +1407,218 @@ class RobotInterface:
                 self.tree.insert('', 'end', values=("Gripper", gripper))
                 self.tree.insert('', 'end', values=("Communication Protocols", ', '.join(communication_protocols)))
                 self.tree.insert('', 'end', values=("Addons", ', '.join(addons)))
-                self.tree.insert('', 'end', values=("Hexadecimal Value", hex(hex_result)))
+                self.tree.insert('', 'end', values=("Hexadecimal Value", code))
+                self.remember_order(code, (robot, color, gripper, communication_protocols, addons)) # Remember the order, it is written to disk in the background
+
+# Columns of the CSV archive written by the ingest daemon
+INGEST_HEAD_BYTES = 256 # Bytes at the start of an order file whose CRC identifies the file in the checkpoint
+SINK_HEADER = ("Source", "Hexadecimal Value", "Status", "Robot Type", "Robot Name", "Gripper", "Communication Protocols", "Addons")
+
+# Headless ingest mode: watches a directory for order files dropped by the ERP, decodes only newly appended lines and archives them to a CSV sink
+# Progress is checkpointed as a byte offset per file together with the committed size of the sink,
+# so after a restart the uncommitted tail of the sink is dropped and decoding resumes exactly at the checkpointed offsets
+class IngestDaemon:
+    def __init__(self, watch_dir, sink_file, checkpoint_file=None, pattern="*.txt", code_mode="checked", compatibility=None, poll_interval=0.2, batch_size=5000, read_size=1 << 20, cache_size=65536):
+        self.watch_dir = watch_dir # Directory the ERP drops order files into
+        self.sink_file = sink_file # CSV archive receiving the decoded orders
+        self.checkpoint_file = checkpoint_file or sink_file + ".checkpoint.json" # Persisted offsets, next to the sink by default
+        self.pattern = pattern # Only files matching this pattern are ingested
+        self.code_mode = code_mode # One of CODE_MODES, "legacy" or "any" must be chosen explicitly to accept codes without checksum
+        self.compatibility = compatibility or CompatibilityMatrix.from_file() # Orders a robot name does not support are archived as "incompatible"
+        self.poll_interval = poll_interval # Seconds between directory scans, bounds the latency of a new code
+        self.batch_size = batch_size # Rows buffered before they are written to the sink in one go
+        self.read_size = read_size # Bytes read from an order file at a time
+        self.cache_size = cache_size # Number of decoded codes remembered, repeated codes skip decoding
+        self.offsets = {} # Committed state per file name: {"offset": bytes consumed, "inode": file identity, "head": CRC of its first bytes, "head_size": their count}
+        self.sink_size = 0 # Committed size of the sink in bytes
+        self.pending = [] # Decoded rows not yet written to the sink
+        self.pending_offsets = {} # Offsets reached by the pending rows, committed together with them
+        self.cache = {} # Raw code bytes -> decoded row without the source column
+        self.running = False # Cleared by the signal handlers to stop after the current pass
+
+    # Function restores the offsets and rolls the sink back to its last committed size
+    def load_checkpoint(self):
+        if os.path.exists(self.checkpoint_file):
+            with open(self.checkpoint_file) as f:
+                checkpoint = json.load(f)
+            self.offsets = checkpoint["files"]
+            self.sink_size = checkpoint["sink_size"]
+            # Rows written after the last checkpoint are dropped, they are decoded again from the checkpointed offsets
+            if os.path.exists(self.sink_file) and os.path.getsize(self.sink_file) > self.sink_size:
+                with open(self.sink_file, "r+b") as f:
+                    f.truncate(self.sink_size)
+        # Without a checkpoint (or if the sink was removed) continue appending after whatever the sink holds now
+        if not os.path.exists(self.checkpoint_file) or not os.path.exists(self.sink_file) or os.path.getsize(self.sink_file) < self.sink_size:
+            self.sink_size = os.path.getsize(self.sink_file) if os.path.exists(self.sink_file) else 0
+
+    # Function persists the offsets atomically so a crash never leaves a half-written checkpoint
+    def save_checkpoint(self):
+        temporary_file = self.checkpoint_file + ".tmp"
+        with open(temporary_file, "w") as f:
+            json.dump({"files": self.offsets, "sink_size": self.sink_size}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_file, self.checkpoint_file)
+
+    # Function decodes a batch of codes into archive rows, reusing earlier results for repeated codes
+    # Corrupt codes are rejected by one batched checksum pass before any field is decoded
+    def decode_lines(self, codes):
+        rows = [self.cache.get(code) for code in codes]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        METRICS.incr("ingest_cache_hits", len(codes) - len(missing))
+        hex_values = [codes[i].decode("ascii", "replace") for i in missing]
+        payloads = []
+        for hex_value, valid in zip(hex_values, validate_codes(hex_values, self.code_mode)):
+            try:
+                payloads.append(code_payload(hex_value) if valid else None)
+            except ValueError:
+                payloads.append(None) # One unreadable line is archived as corrupt instead of stopping the daemon on every restart
+        violations = iter(self.compatibility.check_orders([payload for payload in payloads if payload is not None])) # One pass over the intact codes
+        for i, hex_value, payload in zip(missing, hex_values, payloads):
+            violation = next(violations) if payload is not None else 0
+            decoded_values = decode_payload(payload) if payload is not None else None # Same rules as the GUI decoding
+            if payload is None:
+                # Tell intact codes that the code mode does not accept apart from codes that failed their checksum or cannot be read
+                value = check_code(hex_value, "any")
+                if value is None:
+                    METRICS.incr("ingest_corrupt_codes")
+                    status = "corrupt"
+                else:
+                    METRICS.incr("ingest_rejected_codes")
+                    status = "unchecksummed" if self.code_mode == "checked" else "rejected"
+                row = (hex_value, status, "", "", "", "", "")
+            elif decoded_values is None:
+                METRICS.incr("ingest_invalid_codes")
+                row = (hex_value, "invalid", "", "", "", "", "")
+            else:
+                if violation:
+                    METRICS.incr("ingest_incompatible_codes")
+                decoded_robot, decoded_color, decoded_gripper, decoded_communication_protocols, decoded_addons = decoded_values
+                row = (hex_value, "incompatible" if violation else "ok", decoded_robot, decoded_color, decoded_gripper, ', '.join(decoded_communication_protocols), ', '.join(decoded_addons))
+            if len(self.cache) >= self.cache_size:
+                self.cache.clear() # Keep the cache bounded, it refills with the codes that are currently arriving
+            self.cache[codes[i]] = row
+            rows[i] = row
+        return rows
+
+    # Function decodes the complete lines appended to one order file since its last offset
+    # Returns True if it stopped early because a full batch is waiting to be committed
+    def read_new_lines(self, entry):
+        stat = os.stat(entry.path) # Unlike DirEntry.stat(), this fills in the file identity (st_ino) on Windows as well
+        state = self.pending_offsets.get(entry.name) or self.offsets.get(entry.name)
+        offset = state["offset"] if state else 0
+        if state and (state["inode"] != stat.st_ino or stat.st_size < offset):
+            offset = 0 # The file was replaced or truncated, start from its beginning
+        with open(entry.path, "rb") as f:
+            if offset and "head" in state:
+                # Compare the first bytes as well, a file replaced by one of the same size or larger keeps its name and may keep its identity
+                if binascii.crc32(f.read(state["head_size"])) != state["head"]:
+                    offset = 0
+            if stat.st_size == offset:
+                return False
+            f.seek(offset)
+            while offset < stat.st_size:
+                data = f.read(self.read_size)
+                end = data.rfind(b"\n")
+                if end < 0:
+                    break # Only an unfinished line is left, wait until the writer completes it
+                if offset == 0:
+                    head = data[:min(end + 1, INGEST_HEAD_BYTES)] # Remember the start of the file to recognize it later
+                    state = {"head": binascii.crc32(head), "head_size": len(head)}
+                codes = [code for code in (line.strip() for line in data[:end].split(b"\n")) if code]
+                rows = [(entry.name,) + row for row in self.decode_lines(codes)]
+                offset += end + 1
+                f.seek(offset)
+                self.pending.extend(rows)
+                self.pending_offsets[entry.name] = {"offset": offset, "inode": stat.st_ino, "head": state.get("head", 0), "head_size": state.get("head_size", 0)}
+                if len(self.pending) >= self.batch_size:
+                    return True # Let the caller write the batch instead of holding the whole burst in memory
+        return False
+
+    # Function scans the watch folder once
+    # A file that cannot be read right now (moved, deleted or still locked by the ERP) is skipped until the next pass
+    @instrumented("ingest.scan")
+    def scan(self):
+        names = set()
+        for entry in sorted(os.scandir(self.watch_dir), key=lambda entry: entry.name):
+            names.add(entry.name)
+            more = True
+            while more:
+                try:
+                    more = entry.is_file() and fnmatch.fnmatch(entry.name, self.pattern) and self.read_new_lines(entry)
+                except OSError:
+                    METRICS.incr("ingest_file_errors")
+                    break
+                if len(self.pending) >= self.batch_size:
+                    self.commit()
+        # Forget the offsets of files that are gone, so the checkpoint does not grow forever
+        gone = [name for name in self.offsets if name not in names]
+        for name in gone:
+            del self.offsets[name]
+            self.pending_offsets.pop(name, None)
+        if gone and not self.pending_offsets:
+            self.save_checkpoint() # Nothing pending, so nothing else writes the checkpoint on this pass
+
+    # Function appends the pending rows to the sink and then checkpoints the offsets they came from
+    @instrumented("ingest.commit")
+    def commit(self):
+        if not self.pending_offsets:
+            return
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if self.sink_size == 0:
+            writer.writerow(SINK_HEADER) # New archive, start with the column names
+        writer.writerows(self.pending)
+        data = buffer.getvalue().encode("utf-8")
+        with open(self.sink_file, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno()) # The rows must be on disk before the checkpoint claims them
+        self.sink_size += len(data)
+        self.offsets.update(self.pending_offsets)
+        self.save_checkpoint()
+        METRICS.incr("ingest_codes", len(self.pending))
+        self.pending = []
+        self.pending_offsets = {}
+
+    # Function signal handler, lets the current pass finish and commit before the daemon exits
+    def stop(self, signum=None, frame=None):
+        self.running = False
+
+    # Function runs the daemon until it is stopped with Ctrl+C or SIGTERM
+    def run(self):
+        self.load_checkpoint()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, self.stop)
+            signal.signal(signal.SIGTERM, self.stop)
+        self.running = True
+        while self.running:
+            started = time.monotonic()
+            self.scan()
+            self.commit() # Commit whatever this pass decoded, so no code waits longer than one poll interval
+            time.sleep(max(0.0, self.poll_interval - (time.monotonic() - started)))
 
 # Main execution
 if __name__ == "__main__":
-    try:
-        root = tk.Tk() # Create the main application window
-        app = RobotInterface(root) # Create an instance of the RobotInterface class
-        root.mainloop() # Keep the application running until the user closes it
-    except Exception as e:
-        print(f"An error occurred: {e}") # Return error if there is any mistake 
+    parser = argparse.ArgumentParser(description="Encode and decode robot specifications")
+    parser.add_argument("--ingest", metavar="DIRECTORY", help="run headless and decode the codes appended to order files in DIRECTORY")
+    parser.add_argument("--sink", default="orders_archive.csv", help="CSV archive the ingested orders are appended to")
+    parser.add_argument("--checkpoint", help="checkpoint file with the ingest offsets (default: next to the sink)")
+    parser.add_argument("--pattern", default="*.txt", help="order file name pattern (default: *.txt)")
+    parser.add_argument("--code-mode", choices=CODE_MODES, default="checked", help="which codes to accept: checksummed only (default), legacy only, or both")
+    args = parser.parse_args()
+    if args.ingest:
+        IngestDaemon(args.ingest, args.sink, args.checkpoint, args.pattern, args.code_mode).run() # Headless ingest mode, no window is opened
+        if METRICS.enabled:
+            METRICS.export(METRICS_DIR) # Write the metrics snapshot once the daemon stops
+    else:
+        try:
+            root = tk.Tk() # Create the main application window
+            app = RobotInterface(root) # Create an instance of the RobotInterface class
+            root.mainloop() # Keep the application running until the user closes it
+            app.recent_orders.close() # Wait until the last recent orders are saved
+            if METRICS.enabled:
+                METRICS.export(METRICS_DIR) # Write the metrics snapshot once the window is closed
+        except Exception as e:
+            print(f"An error occurred: {e}") # Return error if there is any mistake 
         
\ No newline at end of file
@@ -0,0 +1,226 @@
+# Tests for the checksummed code validation, run with: python -m pytest
+import pstats
+import pytest
+
+pytest.importorskip("fpdf") # The application module imports the GUI dependencies at the top
+pytest.importorskip("pyperclip")
+
+import arburgupdated as app
+
+# Specification value of README example 1: Iontec, KR 20 R3100 Iontec, Vacuum Gripper
+EXAMPLE_VALUE = 0x100170043cc10f000
+VALID_CODE = app.format_code(EXAMPLE_VALUE, checksum=True)
+LEGACY_CODE = hex(EXAMPLE_VALUE)
+
+# Function returns the flags the scalar check gives for a batch
+def scalar_flags(hex_values, mode):
+    return [app.check_code(hex_value, mode) is not None for hex_value in hex_values]
+
+def test_checksummed_code_round_trip():
+    assert len(VALID_CODE) == 2 + app.CHECKED_CODE_DIGITS
+    assert app.decode_code(VALID_CODE) == app.decode_code(LEGACY_CODE)
+    assert app.decode_code(VALID_CODE, "legacy") is None
+    assert app.decode_code(LEGACY_CODE, "checked") is None
+
+def test_single_digit_typo_is_rejected():
+    for i in range(2, len(VALID_CODE)):
+        for digit in "0123456789abcdef":
+            if digit != VALID_CODE[i]:
+                assert app.check_code(VALID_CODE[:i] + digit + VALID_CODE[i + 1:], "checked") is None
+
+@pytest.mark.parametrize("mode", app.CODE_MODES)
+def test_validate_codes_matches_check_code_on_mixed_batch(mode):
+    codes = [app.format_code(EXAMPLE_VALUE + i, checksum=True) for i in range(50)]
+    corrupted = [code[:5] + ("1" if code[5] == "0" else "0") + code[6:] for code in codes[:10]]
+    batch = codes + corrupted + [LEGACY_CODE, "0x" + LEGACY_CODE[2:].zfill(24), " " + VALID_CODE + " ", VALID_CODE.upper(), "", "zz", "-1"]
+    assert app.validate_codes(batch, mode) == scalar_flags(batch, mode)
+
+@pytest.mark.parametrize("mode", app.CODE_MODES)
+def test_validate_codes_matches_check_code_on_malformed_batch(mode):
+    batch = [
+        "0x" + "1" * 22 + "0", "00x" + VALID_CODE[2:], # Unequal lengths that add up to two fixed-width codes
+        VALID_CODE[:10] + " " + VALID_CODE[11:], # Embedded whitespace
+        VALID_CODE[:-3] + "zzz", # Non-hex digits
+        "0x0x" + VALID_CODE[4:], # Second prefix inside the code
+        VALID_CODE,
+    ]
+    assert app.validate_codes(batch, mode) == scalar_flags(batch, mode)
+    for i in range(len(batch)):
+        assert app.validate_codes(batch[i:i + 2], mode) == scalar_flags(batch[i:i + 2], mode)
+
+OTHER_CODE = app.format_code(EXAMPLE_VALUE ^ 1, checksum=True) # Same width as VALID_CODE, different content
+
+# Function writes the given order files, runs one ingest pass like a fresh daemon would and returns the archived (source, code, status) rows
+def ingest(tmp_path, files=(), **options):
+    watch_dir = tmp_path / "orders"
+    watch_dir.mkdir(exist_ok=True)
+    for name, text in files:
+        with open(watch_dir / name, "w", newline="") as f:
+            f.write(text)
+    daemon = app.IngestDaemon(str(watch_dir), str(tmp_path / "archive.csv"), compatibility=app.CompatibilityMatrix(), **options)
+    daemon.load_checkpoint()
+    daemon.scan()
+    daemon.commit()
+    return [tuple(row.split(",")[:3]) for row in (tmp_path / "archive.csv").read_text().splitlines()[1:]]
+
+@pytest.mark.parametrize("mode, statuses", [("checked", ["unchecksummed", "ok", "corrupt"]), ("legacy", ["ok", "rejected", "corrupt"]), ("any", ["ok", "ok", "corrupt"])])
+def test_ingest_keeps_rejected_codes_apart_from_corrupt_ones(tmp_path, mode, statuses):
+    rows = ingest(tmp_path, [("orders.txt", LEGACY_CODE + "\n" + VALID_CODE + "\n" + VALID_CODE[:-1] + ("0" if VALID_CODE[-1] != "0" else "1") + "\n")], code_mode=mode)
+    assert [row[2] for row in rows] == statuses
+
+def test_ingest_archives_malformed_line_as_corrupt(tmp_path):
+    rows = ingest(tmp_path, [("orders.txt", "0x" + "1" * 22 + "0\n00x" + VALID_CODE[2:] + "\n" + VALID_CODE + "\n")])
+    assert [row[2] for row in rows] == ["corrupt", "corrupt", "ok"]
+
+def test_ingest_resumes_from_offsets_after_restart(tmp_path):
+    assert ingest(tmp_path, [("a.txt", VALID_CODE + "\n"), ("b.txt", OTHER_CODE + "\n")]) == [("a.txt", VALID_CODE, "ok"), ("b.txt", OTHER_CODE, "ok")]
+    assert len(ingest(tmp_path)) == 2 # Nothing new, nothing is archived twice
+    with open(tmp_path / "orders" / "a.txt", "a", newline="") as f:
+        f.write(OTHER_CODE + "\n")
+    assert ingest(tmp_path)[2:] == [("a.txt", OTHER_CODE, "ok")]
+
+def test_ingest_rolls_sink_back_after_crash_before_checkpoint(tmp_path, monkeypatch):
+    ingest(tmp_path, [("a.txt", VALID_CODE + "\n")])
+    with open(tmp_path / "orders" / "a.txt", "a", newline="") as f:
+        f.write(OTHER_CODE + "\n")
+    def crash():
+        raise RuntimeError("crash")
+    monkeypatch.setattr(app.IngestDaemon, "save_checkpoint", lambda self: crash())
+    with pytest.raises(RuntimeError):
+        ingest(tmp_path) # The row reaches the sink, the offset never reaches the checkpoint
+    monkeypatch.undo()
+    assert len((tmp_path / "archive.csv").read_text().splitlines()) == 3
+    assert ingest(tmp_path) == [("a.txt", VALID_CODE, "ok"), ("a.txt", OTHER_CODE, "ok")]
+
+@pytest.mark.parametrize("replacement", [VALID_CODE[:10] + "\n", OTHER_CODE + "\n", OTHER_CODE + "\n" + VALID_CODE + "\n"])
+def test_ingest_rereads_truncated_or_replaced_file(tmp_path, replacement):
+    ingest(tmp_path, [("a.txt", VALID_CODE + "\n")])
+    rows = ingest(tmp_path, [("a.txt", replacement)]) # Shorter, same size or larger with different content
+    assert [row[1] for row in rows[1:]] == replacement.split()
+
+def test_ingest_waits_for_unfinished_last_line(tmp_path):
+    assert ingest(tmp_path, [("a.txt", VALID_CODE + "\n" + OTHER_CODE[:10])]) == [("a.txt", VALID_CODE, "ok")]
+    with open(tmp_path / "orders" / "a.txt", "a", newline="") as f:
+        f.write(OTHER_CODE[10:] + "\n")
+    assert ingest(tmp_path)[1:] == [("a.txt", OTHER_CODE, "ok")]
+
+def test_ingest_skips_unreadable_file_and_forgets_removed_ones(tmp_path, monkeypatch):
+    ingest(tmp_path, [("a.txt", VALID_CODE + "\n"), ("b.txt", VALID_CODE + "\n")])
+    (tmp_path / "orders" / "a.txt").unlink()
+    stat = app.os.stat
+    def locked_stat(path, *args, **kwargs):
+        if str(path).endswith("c.txt"):
+            raise PermissionError(path) # Still locked by the writer
+        return stat(path, *args, **kwargs)
+    monkeypatch.setattr(app.os, "stat", locked_stat)
+    rows = ingest(tmp_path, [("c.txt", OTHER_CODE + "\n"), ("d.txt", OTHER_CODE + "\n")])
+    monkeypatch.undo()
+    assert rows[2:] == [("d.txt", OTHER_CODE, "ok")]
+    with open(str(tmp_path / "archive.csv") + ".checkpoint.json") as f:
+        assert sorted(app.json.load(f)["files"]) == ["b.txt", "d.txt"]
+    assert ingest(tmp_path)[3:] == [("c.txt", OTHER_CODE, "ok")]
+
+# Function returns the code and spec of the example order with the given addon mask
+def example_order(addons):
+    code = hex(EXAMPLE_VALUE & ~0xFFFF | addons)
+    return code, app.decode_code(code)
+
+def test_recent_orders_survive_restart_without_duplicates(tmp_path):
+    file_name = str(tmp_path / "recent.bin")
+    store = app.RecentOrdersStore(file_name, capacity=4)
+    for addons in (1, 2, 3):
+        store.add(*example_order(addons))
+    for _ in range(10):
+        store.add(*example_order(2)) # Repeating an order must not push the others out of the file
+    store.close()
+    reloaded = app.RecentOrdersStore(file_name, capacity=4)
+    reloaded.load()
+    assert [order[1] for order in reloaded.orders] == [example_order(addons)[0] for addons in (2, 3, 1)]
+    assert reloaded.orders[0][2] == tuple(example_order(2)[1])
+
+@pytest.mark.parametrize("offset", [0, app.RECENT_ORDERS_HEADER.size + 19, app.RECENT_ORDERS_HEADER.size + 10])
+def test_damaged_recent_orders_file_is_rewritten(tmp_path, offset):
+    file_name = str(tmp_path / "recent.bin")
+    store = app.RecentOrdersStore(file_name)
+    for addons in (1, 2):
+        store.add(*example_order(addons))
+    store.close()
+    with open(file_name, "r+b") as f:
+        f.seek(offset) # Damage the header, the robot type index or the code of the oldest record
+        f.write(b"\xff")
+
+    damaged = app.RecentOrdersStore(file_name)
+    damaged.load()
+    damaged.close()
+    expected = [example_order(2)[0]] if offset else []
+    assert [order[1] for order in damaged.orders] == expected
+    assert app.RecentOrdersStore(file_name).read_file() == (damaged.orders, False)
+
+def test_truncated_recent_orders_file_is_rewritten(tmp_path):
+    file_name = str(tmp_path / "recent.bin")
+    with open(file_name, "wb") as f:
+        f.write(app.RECENT_ORDERS_MAGIC)
+    store = app.RecentOrdersStore(file_name)
+    store.load()
+    store.add(*example_order(1))
+    store.close()
+    assert [order[1] for order in app.RecentOrdersStore(file_name).read_file()[0]] == [example_order(1)[0]]
+
+def test_recent_orders_write_error_is_counted(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, "METRICS", app.Metrics(enabled=True))
+    store = app.RecentOrdersStore(str(tmp_path)) # A directory cannot be opened as the ring file
+    store.load()
+    store.add(*example_order(1))
+    store.close()
+    assert app.METRICS.counters == {"recent_orders_write_errors": 1}
+    assert [order[1] for order in store.orders] == [example_order(1)[0]] # The session keeps its history
+
+@pytest.mark.parametrize("options", [{"gripper": ["Vacuum Gripper"]}, {"protocols": ["Wifi"]}, {"grippers": ["Vacuum"]}, {"addons": ["FSD", "Lidar"]}])
+def test_compatibility_data_rejects_unknown_keys_and_names(options):
+    with pytest.raises(ValueError):
+        app.CompatibilityMatrix({"KR 20 R3100 Iontec": options})
+
+def test_compatibility_matrix_flags_unsupported_options():
+    matrix = app.CompatibilityMatrix({"KR 20 R3100 Iontec": {"grippers": ["Vacuum Gripper"], "protocols": ["WIFI", "EtherCAT", "5G", "Profinet", "TCP/IP"]}})
+    unsupported = EXAMPLE_VALUE | app.names_to_mask(["Modbus"], app.PROTOCOL_NAMES) << 16
+    assert matrix.violations(EXAMPLE_VALUE) == 0
+    assert matrix.violation_names(matrix.violations(unsupported)) == ["Modbus"]
+    assert matrix.check_orders([EXAMPLE_VALUE, unsupported]) == [0, matrix.violations(unsupported)]
+
+def test_metrics_export_cumulative_buckets_and_json_snapshot(tmp_path):
+    metrics = app.Metrics(enabled=True)
+    for seconds in (0.0001, 0.003, 0.003, 10.0):
+        metrics.observe("decode", seconds)
+    with pytest.raises(ValueError):
+        metrics.run("decode", int, ("x",), {})
+    metrics.incr("cache_hits", 2)
+    lines = metrics.to_prometheus().splitlines()
+    assert 'arburg_calls_total{name="decode"} 5' in lines
+    assert 'arburg_errors_total{name="decode"} 1' in lines
+    assert 'arburg_events_total{name="cache_hits"} 2' in lines
+    assert 'arburg_latency_seconds_bucket{name="decode",le="0.0005"} 2' in lines # The failed call was fast as well
+    assert 'arburg_latency_seconds_bucket{name="decode",le="0.001"} 2' in lines
+    assert 'arburg_latency_seconds_bucket{name="decode",le="0.005"} 4' in lines
+    assert 'arburg_latency_seconds_bucket{name="decode",le="2.5"} 4' in lines
+    assert 'arburg_latency_seconds_bucket{name="decode",le="+Inf"} 5' in lines
+    assert 'arburg_latency_seconds_count{name="decode"} 5' in lines
+    metrics.export(str(tmp_path))
+    with open(tmp_path / "arburg_metrics.json") as f:
+        snapshot = app.json.load(f)
+    assert snapshot["calls"] == {"decode": 5} and snapshot["errors"] == {"decode": 1} and snapshot["counters"] == {"cache_hits": 2}
+    assert snapshot["latency_seconds"]["decode"]["buckets"]["0.005"] == 2 # Per bucket in the snapshot, not cumulative
+    assert snapshot["latency_seconds"]["decode"]["count"] == 5
+    assert (tmp_path / "arburg_metrics.prom").read_text() == metrics.to_prometheus()
+
+def test_metrics_profile_only_outermost_call(tmp_path):
+    metrics = app.Metrics(enabled=True, profile_dir=str(tmp_path))
+    def inner(value):
+        return value + 1
+    def outer(value):
+        return metrics.run("inner", inner, (value,), {}) * 2
+    assert metrics.run("outer", outer, (1,), {}) == 4
+    assert metrics.run("inner", inner, (1,), {}) == 2
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["inner-000002.prof", "outer-000001.prof"]
+    assert metrics.snapshot()["calls"] == {"inner": 2, "outer": 1}
+    profiled = pstats.Stats(str(tmp_path / "outer-000001.prof")).stats
+    assert any(function == "inner" for _, _, function in profiled) # The outer dump includes the nested call